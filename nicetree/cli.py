@@ -1,13 +1,18 @@
-import argparse
 import sys
 from pathlib import Path
-from typing import Optional, List
+from types import SimpleNamespace
+from typing import Optional, List, Union, TYPE_CHECKING
 
 from nicetree.tree import TreeGenerator
 from nicetree.formatter import TreeFormatter, OutputFormat
 
+if TYPE_CHECKING:
+    import argparse
 
-def create_parser() -> argparse.ArgumentParser:
+
+def create_parser() -> "argparse.ArgumentParser":
+    import argparse
+    
     parser = argparse.ArgumentParser(
         prog="nicetree",
         description="Display a directory tree structure in a nice format",
@@ -62,6 +67,12 @@ def create_parser() -> argparse.ArgumentParser:
         help="Show file sizes"
     )
     
+    parser.add_argument(
+        "--accurate-size",
+        action="store_true",
+        help="With --size, include content below the --depth limit in directory sizes"
+    )
+    
     parser.add_argument(
         "-S", "--statistics",
         action="store_true",
@@ -97,7 +108,23 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def validate_arguments(args: argparse.Namespace) -> None:
+def default_arguments(path: str = ".") -> SimpleNamespace:
+    return SimpleNamespace(
+        path=path,
+        depth=None,
+        ignore_patterns=[],
+        all=False,
+        follow=False,
+        size=False,
+        accurate_size=False,
+        statistics=False,
+        charset="auto",
+        no_colors=False,
+        format="tree",
+    )
+
+
+def validate_arguments(args: Union["argparse.Namespace", SimpleNamespace]) -> None:
 
     path = Path(args.path)
     
@@ -116,8 +143,13 @@ def validate_arguments(args: argparse.Namespace) -> None:
 
 def main(argv: Optional[List[str]] = None) -> int:
 
-    parser = create_parser()
-    args = parser.parse_args(argv)
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    if not argv or (len(argv) == 1 and not argv[0].startswith("-")):
+        args = default_arguments(*argv)
+    else:
+        args = create_parser().parse_args(argv)
     
     try:
         validate_arguments(args)
@@ -129,14 +161,9 @@ def main(argv: Optional[List[str]] = None) -> int:
             show_hidden=args.all,
             follow_symlinks=args.follow,
             show_size=args.size,
+            accurate_size=args.accurate_size,
         )
         
-        root_node = generator.generate()
-        
-        if root_node is None:
-            print("Error: Could not generate tree", file=sys.stderr)
-            return 1
-        
         formatter = TreeFormatter(
             charset=args.charset,
             colors=not args.no_colors,
@@ -144,6 +171,18 @@ def main(argv: Optional[List[str]] = None) -> int:
             format_type=OutputFormat(args.format),
         )
         
+        if not (args.statistics or args.size or args.format == "json"):
+            if not formatter.print_stream(generator.iter_entries(), show_root=True):
+                print("Error: Could not generate tree", file=sys.stderr)
+                return 1
+            return 0
+        
+        root_node = generator.generate()
+        
+        if root_node is None:
+            print("Error: Could not generate tree", file=sys.stderr)
+            return 1
+        
         formatter.print_tree(root_node, show_root=True)
         
         if args.statistics:
@@ -1,7 +1,9 @@
+import io
+import os
 import sys
 
 from pathlib import Path
-from typing import Optional, List, Callable
+from typing import Optional, List, Dict, Callable, TextIO, Tuple, Iterable, Union
 from enum import Enum
 from nicetree.tree import TreeNode
 
@@ -17,6 +19,7 @@ class TreeFormatter:
     LAST_CONNECTOR = "└── "
     PIPE = "│   "
     BLANK = "    "
+    STREAM_BUFFER_SIZE = 65536
     
     def __init__(
         self,
@@ -28,6 +31,10 @@ class TreeFormatter:
         self.show_size = show_size
         self.format_type = format_type
         self.colors = colors and self._supports_colors()
+        self._buffer = io.StringIO()
+        self._resolved_targets: Dict[str, str] = {}
+        
+        self._set_colors()
         
         self._set_charset(charset)
     
@@ -63,19 +70,20 @@ class TreeFormatter:
             self.PIPE = "|   "
             self.BLANK = "    "
     
-    def _get_color_code(self, color_type: str) -> str:
+    def _set_colors(self) -> None:
       
-        if not self.colors:
-            return ""
-        
-        colors = {
-            "dir": "\033[34m",
-            "symlink": "\033[36m",
-            "reset": "\033[0m",
-            "bold": "\033[1m",
-            "gray": "\033[90m",
-        }
-        return colors.get(color_type, "")
+        if self.colors:
+            self._c_dir = "\033[34m"
+            self._c_sym = "\033[36m"
+            self._c_reset = "\033[0m"
+            self._c_bold = "\033[1m"
+            self._c_gray = "\033[90m"
+        else:
+            self._c_dir = ""
+            self._c_sym = ""
+            self._c_reset = ""
+            self._c_bold = ""
+            self._c_gray = ""
     
     def _format_size(self, size: int) -> str:
       
@@ -85,6 +93,17 @@ class TreeFormatter:
             size /= 1024
         return f"{size:.1f}PB"
     
+    def _resolve_target(self, path: str) -> str:
+      
+        target = self._resolved_targets.get(path)
+        if target is None:
+            try:
+                target = str(Path(path).resolve())
+            except Exception:
+                target = "[circular]"
+            self._resolved_targets[path] = target
+        return target
+    
     def _format_node_name(self, node: TreeNode) -> str:
       
         name = node.name
@@ -93,23 +112,19 @@ class TreeFormatter:
             name += "/"
         
         if node.is_symlink:
-            name += " -> "
-            try:
-                target = Path(node.path).resolve()
-                name += str(target)
-            except Exception:
-                name += "[circular]"
+            target = node.symlink_target
+            if target is None:
+                target = self._resolve_target(node.path)
+            name += f" -> {target}"
         
         if self.colors:
             if node.is_symlink:
-                name = f"{self._get_color_code('symlink')}{name}{self._get_color_code('reset')}"
+                name = f"{self._c_sym}{name}{self._c_reset}"
             elif node.is_dir:
-                name = f"{self._get_color_code('dir')}{name}{self._get_color_code('reset')}"
+                name = f"{self._c_dir}{name}{self._c_reset}"
         
         if self.show_size and node.size > 0:
-            size_str = self._format_size(node.size)
-            size_str = f" {self._get_color_code('gray')}({size_str}){self._get_color_code('reset')}"
-            name += size_str
+            name += f" {self._c_gray}({self._format_size(node.size)}){self._c_reset}"
         
         return name
     
@@ -117,71 +132,186 @@ class TreeFormatter:
         if node is None:
             return ""
         
+        return self._render(node, show_root, trailing_newline=False)
+    
+    def _render(
+        self,
+        node: TreeNode,
+        show_root: bool,
+        trailing_newline: bool = True
+    ) -> str:
+        buffer = self._buffer
         if self.format_type == OutputFormat.JSON:
-            return self._format_as_json(node)
+            self.write_json(node, buffer)
+            if trailing_newline:
+                buffer.write("\n")
+        else:
+            self.write_tree(node, buffer, show_root)
+            if not trailing_newline and buffer.tell():
+                buffer.truncate(buffer.tell() - 1)
+        
+        output = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return output
+    
+    def write_tree(
+        self,
+        node: Optional[TreeNode],
+        out: TextIO,
+        show_root: bool = True
+    ) -> None:
+        if node is None:
+            return
         
-        lines = []
+        write = out.write
+        format_name = self._format_node_name
+        connector_mid = self.CONNECTOR
+        connector_last = self.LAST_CONNECTOR
+        pipe = self.PIPE
+        blank = self.BLANK
         
         if show_root:
-            lines.append(self._format_node_name(node))
-        
-        if node.children:
-            for i, child in enumerate(node.children):
-                is_last = i == len(node.children) - 1
-                lines.extend(
-                    self._format_node_recursive(
-                        child, "", is_last
-                    )
-                )
-        
-        return "\n".join(lines)
-    
-    def _format_node_recursive(
-        self, 
-        node: TreeNode, 
-        prefix: str, 
-        is_last: bool
-    ) -> List[str]:
-
-        lines = []
+            write(f"{format_name(node)}\n")
         
-        connector = self.LAST_CONNECTOR if is_last else self.CONNECTOR
-        lines.append(prefix + connector + self._format_node_name(node))
+        stack: List[Tuple[TreeNode, str, bool]] = []
+        push = stack.append
+        pop = stack.pop
         
-        if node.children:
-            extension = self.BLANK if is_last else self.PIPE
-            new_prefix = prefix + extension
+        children = node.children
+        if children:
+            push((children[-1], "", True))
+            for child in children[-2::-1]:
+                push((child, "", False))
+        
+        while stack:
+            node, prefix, is_last = pop()
+            if is_last:
+                write(f"{prefix}{connector_last}{format_name(node)}\n")
+            else:
+                write(f"{prefix}{connector_mid}{format_name(node)}\n")
+            
+            children = node.children
+            if children:
+                child_prefix = prefix + (blank if is_last else pipe)
+                push((children[-1], child_prefix, True))
+                for child in children[-2::-1]:
+                    push((child, child_prefix, False))
+    
+    def write_stream(
+        self,
+        entries: Iterable[Tuple[int, bool, TreeNode]],
+        out: TextIO,
+        show_root: bool = True
+    ) -> int:
+        write = out.write
+        format_name = self._format_node_name
+        connector_mid = self.CONNECTOR
+        connector_last = self.LAST_CONNECTOR
+        pipe = self.PIPE
+        blank = self.BLANK
+        
+        prefixes = [""]
+        count = 0
+        for depth, is_last, node in entries:
+            count += 1
+            if depth == 0:
+                if show_root:
+                    write(f"{format_name(node)}\n")
+                continue
             
-            for i, child in enumerate(node.children):
-                child_is_last = i == len(node.children) - 1
-                lines.extend(
-                    self._format_node_recursive(child, new_prefix, child_is_last)
-                )
+            del prefixes[depth:]
+            prefix = prefixes[depth - 1]
+            if is_last:
+                write(f"{prefix}{connector_last}{format_name(node)}\n")
+                prefixes.append(prefix + blank)
+            else:
+                write(f"{prefix}{connector_mid}{format_name(node)}\n")
+                prefixes.append(prefix + pipe)
         
-        return lines
+        return count
     
-    def _format_as_json(self, node: Optional[TreeNode]) -> str:
+    def print_stream(
+        self,
+        entries: Iterable[Tuple[int, bool, TreeNode]],
+        show_root: bool = True
+    ) -> int:
+        stdout = sys.stdout
+        buffer = getattr(stdout, "buffer", None)
+        if buffer is None or stdout.isatty():
+            return self.write_stream(entries, stdout, show_root)
+        
+        stdout.flush()
+        writer = io.BufferedWriter(buffer, buffer_size=self.STREAM_BUFFER_SIZE)
+        out = io.TextIOWrapper(
+            writer,
+            encoding=stdout.encoding,
+            errors=stdout.errors,
+            line_buffering=False,
+            write_through=False,
+        )
+        try:
+            return self.write_stream(entries, out, show_root)
+        finally:
+            out.flush()
+            out.detach()
+            writer.flush()
+            writer.detach()
+    
+    def write_json(self, node: Optional[TreeNode], out: TextIO) -> None:
 
         import json
         
-        def node_to_dict(n: TreeNode) -> dict:
-            return {
-                "name": n.name,
-                "type": "directory" if n.is_dir else "file",
-                "symlink": n.is_symlink,
-                "size": n.size,
-                "children": [node_to_dict(child) for child in n.children],
-            }
-        
         if node is None:
-            return json.dumps({}, indent=2)
+            out.write("{}")
+            return
+        
+        encode = json.dumps
+        write = out.write
         
-        return json.dumps(node_to_dict(node), indent=2)
+        stack: List[Union[str, Tuple[TreeNode, str]]] = [(node, "")]
+        push = stack.append
+        pop = stack.pop
+        
+        while stack:
+            item = pop()
+            if isinstance(item, str):
+                write(item)
+                continue
+            
+            n, indent = item
+            inner = indent + "  "
+            write(
+                f"{{\n"
+                f"{inner}\"name\": {encode(n.name)},\n"
+                f"{inner}\"type\": \"{'directory' if n.is_dir else 'file'}\",\n"
+                f"{inner}\"symlink\": {'true' if n.is_symlink else 'false'},\n"
+                f"{inner}\"size\": {n.size},\n"
+                f"{inner}\"children\": "
+            )
+            
+            children = n.children
+            if children:
+                child_indent = inner + "  "
+                push(f"\n{inner}]\n{indent}}}")
+                for child in children[:0:-1]:
+                    push((child, child_indent))
+                    push(f",\n{child_indent}")
+                push((children[0], child_indent))
+                push(f"[\n{child_indent}")
+            else:
+                write(f"[]\n{indent}}}")
     
     def print_tree(self, node: Optional[TreeNode], show_root: bool = True) -> None:
-        output = self.format_tree(node, show_root)
+        if self.format_type == OutputFormat.JSON:
+            if node is not None:
+                self.write_json(node, sys.stdout)
+                sys.stdout.write("\n")
+            return
+        
+        if node is None:
+            return
+        
+        output = self._render(node, show_root)
         if output:
-            print(output)
-
-
-import os
+            sys.stdout.write(output)
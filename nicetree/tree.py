@@ -1,26 +1,46 @@
 import os
+import re
 import sys
+import stat
 import fnmatch
       
 from pathlib import Path
-from typing import List, Dict, Optional, Set, Callable
+from typing import Any, List, Dict, Optional, Callable, Union, Tuple, Iterator
 from dataclasses import dataclass, field
 
 
-@dataclass
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Inodes of the directories above a pending directory, innermost first,
+# as a (inode, parent_chain) linked list; None when symlinks aren't followed.
+_Ancestors = Optional[Tuple[int, Any]]
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class TreeNode:
     name: str
-    path: Path
+    path: str
     is_dir: bool
     is_symlink: bool = False
     children: List['TreeNode'] = field(default_factory=list)
     size: int = 0
+    symlink_target: Optional[str] = None
     
     def __lt__(self, other: 'TreeNode') -> bool:
 
-        if self.is_dir != other.is_dir:
-            return self.is_dir
-        return self.name.lower() < other.name.lower()
+        return _sort_key(self) < _sort_key(other)
+
+
+def _sort_key(node: TreeNode) -> Tuple[bool, str, str]:
+    return (not node.is_dir, node.name.lower(), node.name)
+
+
+def _in_ancestors(inode: int, ancestors: _Ancestors) -> bool:
+    while ancestors is not None:
+        if ancestors[0] == inode:
+            return True
+        ancestors = ancestors[1]
+    return False
 
 
 class TreeGenerator:    
@@ -33,6 +53,8 @@ class TreeGenerator:
         follow_symlinks: bool = False,
         show_size: bool = False,
         case_sensitive: bool = True,
+        workers: Optional[int] = None,
+        accurate_size: bool = False,
     ):
         self.root_path = Path(root_path).resolve()
         self.max_depth = max_depth
@@ -41,123 +63,373 @@ class TreeGenerator:
         self.follow_symlinks = follow_symlinks
         self.show_size = show_size
         self.case_sensitive = case_sensitive
-        self.visited_dirs: Set[int] = set()
+        self.accurate_size = accurate_size
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._ignore_re = self._compile_ignore_patterns()
+        self._resolved_cache: Dict[str, os.stat_result] = {}
+        self._scan_by_fd = (
+            sys.platform.startswith("linux") and os.scandir in os.supports_fd
+        )
         
-    def _should_ignore(self, name: str, path: Path) -> bool:
-      
-        if not self.show_hidden and name.startswith('.'):
-            return True
+    def _compile_ignore_patterns(self) -> Optional["re.Pattern[str]"]:
+        if not self.ignore_patterns:
+            return None
         
-        for pattern in self.ignore_patterns:
-            if self._matches_pattern(name, pattern):
-                return True
+        flags = 0
+        if not self.case_sensitive or os.path.normcase("A") == "a":
+            flags |= re.IGNORECASE
         
-        return False
+        return re.compile(
+            "|".join(
+                f"(?:{fnmatch.translate(pattern)})"
+                for pattern in self.ignore_patterns
+            ),
+            flags
+        )
     
-    def _matches_pattern(self, name: str, pattern: str) -> bool:  
-        name_to_check = name if self.case_sensitive else name.lower()
-        pattern_to_check = pattern if self.case_sensitive else pattern.lower()
+    def _should_ignore(self, name: str, path: Optional[Path] = None) -> bool:
+      
+        if not self.show_hidden and name.startswith('.'):
+            return True
         
-        return fnmatch.fnmatch(name_to_check, pattern_to_check)
+        ignore_re = self._ignore_re
+        return ignore_re is not None and ignore_re.match(name) is not None
     
-    def _is_circular_symlink(self, path: Path) -> bool:
+    def _symlink_stat(self, path: str) -> Optional[os.stat_result]:
       
-        if not path.is_symlink():
-            return False
-        
+        st = self._resolved_cache.get(path)
+        if st is None:
+            try:
+                st = os.stat(path)
+            except (OSError, RuntimeError):
+                return None
+            self._resolved_cache[path] = st
+        return st
+    
+    def _resolve_symlink(self, node: TreeNode, ancestors: _Ancestors) -> Optional[int]:
         try:
-            resolved = path.resolve()
-            inode = os.stat(resolved).st_ino
-            
-            if inode in self.visited_dirs:
-                return True
-            
-            self.visited_dirs.add(inode)
-            return False
-        except (OSError, RuntimeError):
-            return True
+            node.symlink_target = os.readlink(node.path)
+        except OSError:
+            pass
+        
+        if not self.follow_symlinks:
+            return None
+        
+        st = self._symlink_stat(node.path)
+        if st is None:
+            return None
+        
+        inode = st.st_ino
+        if _in_ancestors(inode, ancestors):
+            return None
+        
+        node.is_dir = stat.S_ISDIR(st.st_mode)
+        if self.show_size and not node.is_dir:
+            node.size = st.st_size
+        return inode
     
-    def _get_node_size(self, path: Path) -> int:
+    def _make_node(self, root: Path) -> Optional[TreeNode]:
+        path = os.fspath(root)
         try:
-            if path.is_file():
-                return path.stat().st_size
-            elif path.is_dir():
-                return sum(
-                    f.stat().st_size 
-                    for f in path.rglob('*') 
-                    if f.is_file()
-                )
+            st = os.stat(path, follow_symlinks=False)
         except (OSError, PermissionError):
-            pass
-        return 0
+            return None
+        
+        is_dir = stat.S_ISDIR(st.st_mode)
+        node = TreeNode(
+            name=root.name,
+            path=path,
+            is_dir=is_dir,
+            is_symlink=stat.S_ISLNK(st.st_mode),
+            size=st.st_size if self.show_size and not is_dir else 0
+        )
+        if node.is_symlink:
+            node.size = 0
+            self._resolve_symlink(node, None)
+        return node
     
-    def _build_tree(self, path: Path, depth: int = 0) -> Optional[TreeNode]:
-        if self.max_depth is not None and depth > self.max_depth:
+    def _root_ancestors(self, root_node: TreeNode) -> _Ancestors:
+        if not self.follow_symlinks:
             return None
         
-
-        if self._should_ignore(path.name, path):
+        try:
+            return (os.stat(root_node.path).st_ino, None)
+        except OSError:
             return None
+    
+    def _scan_dir(
+        self,
+        node: TreeNode,
+        ancestors: _Ancestors = None
+    ) -> List[Tuple[TreeNode, _Ancestors]]:
+        show_hidden = self.show_hidden
+        ignore_match = self._ignore_re.match if self._ignore_re is not None else None
+        show_size = self.show_size
+        follow = self.follow_symlinks
         
+        prefix = os.path.join(node.path, "")
+        children = node.children
+        add_child = children.append
+        has_symlinks = False
+        inodes: Dict[str, int] = {}
+        dir_fd = None
         try:
-            is_symlink = path.is_symlink()
-            try:
-                is_dir = path.is_dir(follow_symlinks=False)
-            except TypeError:
-                is_dir = path.is_dir() if not is_symlink else False
-            
-            if is_symlink:
-                if not self.follow_symlinks:
-                    return TreeNode(
-                        name=path.name,
-                        path=path,
-                        is_dir=False,
-                        is_symlink=True,
-                        size=0
-                    )
-                
-                if self._is_circular_symlink(path):
-                    return TreeNode(
-                        name=path.name,
-                        path=path,
-                        is_dir=False,
-                        is_symlink=True,
-                        size=0
-                    )
+            if show_size and self._scan_by_fd:
+                dir_fd = os.open(node.path, os.O_RDONLY | os.O_DIRECTORY)
+                it = os.scandir(dir_fd)
+            else:
+                it = os.scandir(node.path)
             
-            node = TreeNode(
-                name=path.name,
-                path=path,
-                is_dir=is_dir,
-                is_symlink=is_symlink,
-                size=self._get_node_size(path) if self.show_size else 0
+            with it:
+                for entry in it:
+                    name = entry.name
+                    if not show_hidden and name.startswith('.'):
+                        continue
+                    if ignore_match is not None and ignore_match(name):
+                        continue
+                    
+                    try:
+                        is_symlink = entry.is_symlink()
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        size = 0
+                        if show_size and not (is_dir or is_symlink):
+                            size = entry.stat(follow_symlinks=False).st_size
+                        
+                        if is_symlink:
+                            has_symlinks = True
+                            child = TreeNode(
+                                name=name,
+                                path=prefix + name,
+                                is_dir=False,
+                                is_symlink=True
+                            )
+                        else:
+                            child = TreeNode(
+                                name=name,
+                                path=prefix + name,
+                                is_dir=is_dir,
+                                size=size
+                            )
+                            if follow and is_dir:
+                                inodes[name] = entry.inode()
+                    except (OSError, PermissionError):
+                        continue
+                    
+                    add_child(child)
+        except (OSError, PermissionError):
+            pass
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+        
+        children.sort(key=_sort_key)
+        
+        if has_symlinks:
+            resolve_symlink = self._resolve_symlink
+            for child in children:
+                if child.is_symlink:
+                    inode = resolve_symlink(child, ancestors)
+                    if inode is not None:
+                        inodes[child.name] = inode
+            children.sort(key=_sort_key)
+        
+        if not follow:
+            return [(child, None) for child in children if child.is_dir]
+        
+        return [
+            (child, (inodes[child.name], ancestors))
+            for child in children
+            if child.is_dir
+        ]
+    
+    def _fill_subtree_size(self, node: TreeNode, ancestors: _Ancestors = None) -> None:
+        top = node.path
+        if node.is_symlink:
+            top = os.path.realpath(top)
+        
+        should_ignore = self._should_ignore
+        follow = self.follow_symlinks
+        
+        def entry_stat(dirpath: str, dirfd: Optional[int], name: str) -> os.stat_result:
+            if dirfd is None:
+                return os.stat(os.path.join(dirpath, name), follow_symlinks=follow)
+            return os.stat(name, dir_fd=dirfd, follow_symlinks=follow)
+        
+        if hasattr(os, "fwalk"):
+            walk = os.fwalk(top, follow_symlinks=follow)
+        else:
+            walk = (
+                (dirpath, dirnames, filenames, None)
+                for dirpath, dirnames, filenames in os.walk(top, followlinks=follow)
             )
-            
-            if is_dir:
-                try:
-                    entries = sorted(path.iterdir())
-                except PermissionError:
-                    return node
-                
-                for entry in entries:
-                    child_node = self._build_tree(entry, depth + 1)
-                    if child_node:
-                        node.children.append(child_node)
+        
+        chains = {top: ancestors}
+        total = 0
+        try:
+            for dirpath, dirnames, filenames, dirfd in walk:
+                if follow:
+                    chain = chains.pop(dirpath, None)
+                    kept = []
+                    for name in dirnames:
+                        if should_ignore(name):
+                            continue
+                        try:
+                            inode = entry_stat(dirpath, dirfd, name).st_ino
+                        except OSError:
+                            continue
+                        if _in_ancestors(inode, chain):
+                            continue
+                        chains[os.path.join(dirpath, name)] = (inode, chain)
+                        kept.append(name)
+                    dirnames[:] = kept
+                else:
+                    dirnames[:] = [d for d in dirnames if not should_ignore(d)]
                 
-                node.children.sort()
-            
-            return node
+                for name in filenames:
+                    if should_ignore(name):
+                        continue
+                    try:
+                        st = entry_stat(dirpath, dirfd, name)
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(st.st_mode):
+                        total += st.st_size
+        except OSError:
+            pass
         
-        except (OSError, PermissionError):
+        node.size = total
+    
+    def _build_tree(self, root: Path) -> Optional[TreeNode]:
+        if self._should_ignore(root.name, root):
             return None
+        
+        root_node = self._make_node(root)
+        if root_node is None or not root_node.is_dir:
+            return root_node
+        
+        max_depth = self.max_depth
+        scan_dir = self._scan_dir
+        pending = [(root_node, 0, self._root_ancestors(root_node))]
+        scanned = []
+        
+        if self.workers <= 1:
+            size_cutoff = self.show_size and self.accurate_size
+            while pending:
+                node, depth, ancestors = pending.pop()
+                if max_depth is not None and depth >= max_depth:
+                    if size_cutoff:
+                        self._fill_subtree_size(node, ancestors)
+                    continue
+                scanned.append(node)
+                pending.extend(
+                    (child, depth + 1, child_ancestors)
+                    for child, child_ancestors in reversed(scan_dir(node, ancestors))
+                )
+        else:
+            self._build_tree_parallel(pending, scanned)
+        
+        if self.show_size:
+            for node in reversed(scanned):
+                node.size = sum(child.size for child in node.children)
+        
+        return root_node
+    
+    def _build_tree_parallel(
+        self,
+        pending: List[Tuple[TreeNode, int, _Ancestors]],
+        scanned: List[TreeNode]
+    ) -> None:
+        from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+        
+        max_depth = self.max_depth
+        scan_dir = self._scan_dir
+        size_cutoff = self.show_size and self.accurate_size
+        
+        def fill_subtree_size(
+            node: TreeNode,
+            ancestors: _Ancestors
+        ) -> List[Tuple[TreeNode, _Ancestors]]:
+            self._fill_subtree_size(node, ancestors)
+            return []
+        
+        max_in_flight = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            in_flight: Dict[Future, int] = {}
+            while pending or in_flight:
+                while pending and len(in_flight) < max_in_flight:
+                    node, depth, ancestors = pending.pop()
+                    if max_depth is not None and depth >= max_depth:
+                        if size_cutoff:
+                            in_flight[
+                                executor.submit(fill_subtree_size, node, ancestors)
+                            ] = depth
+                        continue
+                    scanned.append(node)
+                    in_flight[executor.submit(scan_dir, node, ancestors)] = depth
+                
+                if not in_flight:
+                    continue
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    depth = in_flight.pop(future)
+                    pending.extend(
+                        (child, depth + 1, child_ancestors)
+                        for child, child_ancestors in reversed(future.result())
+                    )
     
     def generate(self) -> Optional[TreeNode]:
         if not self.root_path.exists():
             raise ValueError(f"Path does not exist: {self.root_path}")
         
-        self.visited_dirs.clear()
+        self._resolved_cache.clear()
         return self._build_tree(self.root_path)
     
+    def iter_entries(self) -> Iterator[Tuple[int, bool, TreeNode]]:
+        if not self.root_path.exists():
+            raise ValueError(f"Path does not exist: {self.root_path}")
+        
+        self._resolved_cache.clear()
+        root = self.root_path
+        if self._should_ignore(root.name, root):
+            return
+        
+        root_node = self._make_node(root)
+        if root_node is None:
+            return
+        
+        yield 0, True, root_node
+        
+        max_depth = self.max_depth
+        if not root_node.is_dir or max_depth == 0:
+            return
+        
+        scan_dir = self._scan_dir
+        subdirs = scan_dir(root_node, self._root_ancestors(root_node))
+        
+        stack = [[root_node.children, 0, 1, iter(subdirs)]]
+        while stack:
+            frame = stack[-1]
+            children, index, depth, subdirs = frame
+            if index == len(children):
+                stack.pop()
+                continue
+            
+            frame[1] = index + 1
+            child = children[index]
+            yield depth, index == len(children) - 1, child
+            
+            if not child.is_dir:
+                continue
+            
+            _, ancestors = next(subdirs)
+            if max_depth is None or depth < max_depth:
+                child_subdirs = scan_dir(child, ancestors)
+                if child.children:
+                    stack.append(
+                        [child.children, 0, depth + 1, iter(child_subdirs)]
+                    )
+    
     def get_tree_stats(self, node: Optional[TreeNode] = None) -> Dict[str, int]:
         if node is None:
             node = self.generate()
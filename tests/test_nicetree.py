@@ -7,7 +7,7 @@ import tempfile
 from pathlib import Path
 from nicetree.tree import TreeGenerator, TreeNode
 from nicetree.formatter import TreeFormatter, OutputFormat
-from nicetree.cli import main
+from nicetree.cli import main, create_parser, default_arguments
 from io import StringIO
 
 class TestTreeNode(unittest.TestCase):
@@ -16,7 +16,7 @@ class TestTreeNode(unittest.TestCase):
 
         node = TreeNode(
             name="test",
-            path=Path("/test"),
+            path="/test",
             is_dir=True,
         )
         self.assertEqual(node.name, "test")
@@ -25,8 +25,8 @@ class TestTreeNode(unittest.TestCase):
     
     def test_node_sorting(self):
 
-        dir_node = TreeNode(name="a_dir", path=Path("/a"), is_dir=True)
-        file_node = TreeNode(name="b_file", path=Path("/b"), is_dir=False)
+        dir_node = TreeNode(name="a_dir", path="/a", is_dir=True)
+        file_node = TreeNode(name="b_file", path="/b", is_dir=False)
         
         nodes = [file_node, dir_node]
         nodes.sort()
@@ -34,6 +34,20 @@ class TestTreeNode(unittest.TestCase):
         self.assertTrue(nodes[0].is_dir)
         self.assertFalse(nodes[1].is_dir)
 
+    def test_node_sorting_breaks_case_ties(self):
+        lower = TreeNode(name="b", path="/b", is_dir=False)
+        upper = TreeNode(name="B", path="/B", is_dir=False)
+
+        nodes = [lower, upper]
+        nodes.sort()
+
+        self.assertEqual([n.name for n in nodes], ["B", "b"])
+
+    @unittest.skipIf(sys.version_info < (3, 10), "dataclass slots need 3.10+")
+    def test_node_uses_slots(self):
+        node = TreeNode(name="test", path="/test", is_dir=False)
+        self.assertFalse(hasattr(node, "__dict__"))
+
 
 class TestTreeGenerator(unittest.TestCase):
 
@@ -104,6 +118,206 @@ class TestTreeGenerator(unittest.TestCase):
         for name in all_names:
             self.assertFalse(name.endswith(".txt"))
     
+    def test_ignore_patterns_case_insensitive(self):
+        generator = TreeGenerator(
+            str(self.root),
+            ignore_patterns=["DIR*", "*.TXT"],
+            case_sensitive=False
+        )
+        root_node = generator.generate()
+
+        names = [child.name for child in root_node.children]
+        self.assertEqual(names, [])
+
+    def test_directory_size_is_sum_of_children(self):
+        (self.root / "dir1" / "file1.txt").write_text("abc")
+        (self.root / "dir1" / "subdir1" / "file2.txt").write_text("hello")
+
+        generator = TreeGenerator(str(self.root), show_size=True)
+        root_node = generator.generate()
+
+        dir1 = next(c for c in root_node.children if c.name == "dir1")
+        self.assertEqual(dir1.size, 8)
+        self.assertEqual(root_node.size, 8)
+
+    def test_accurate_size_below_depth_limit(self):
+        (self.root / "dir1" / "subdir1" / "file2.txt").write_text("hello")
+
+        shallow = TreeGenerator(str(self.root), max_depth=1, show_size=True)
+        dir1 = next(c for c in shallow.generate().children if c.name == "dir1")
+        self.assertEqual(dir1.size, 0)
+
+        accurate = TreeGenerator(
+            str(self.root), max_depth=1, show_size=True, accurate_size=True
+        )
+        dir1 = next(c for c in accurate.generate().children if c.name == "dir1")
+        self.assertEqual(dir1.size, 5)
+
+    def test_accurate_size_applies_filters(self):
+        deep = self.root / "dir1" / "subdir1"
+        (deep / ".secret").write_text("abcd")
+        (deep / "g.py").write_text("xyz")
+
+        def dir1_size(**kwargs):
+            generator = TreeGenerator(str(self.root), show_size=True, **kwargs)
+            return next(c for c in generator.generate().children if c.name == "dir1").size
+
+        self.assertEqual(dir1_size(max_depth=1, accurate_size=True), dir1_size())
+        self.assertEqual(
+            dir1_size(max_depth=1, accurate_size=True, ignore_patterns=["*.py"]),
+            dir1_size(ignore_patterns=["*.py"])
+        )
+        self.assertEqual(
+            dir1_size(max_depth=1, accurate_size=True, show_hidden=True),
+            dir1_size(show_hidden=True)
+        )
+
+        ext = self.root / "ext"
+        ext.mkdir()
+        (ext / "big").write_text("x" * 20)
+        os.symlink(ext, deep / "l")
+        os.symlink(ext / "big", deep / "fl")
+        os.symlink(self.root / "dir1", deep / "back")
+        self.assertEqual(
+            dir1_size(max_depth=1, accurate_size=True, follow_symlinks=True),
+            dir1_size(follow_symlinks=True)
+        )
+        self.assertEqual(
+            dir1_size(max_depth=1, accurate_size=True, follow_symlinks=True, workers=1),
+            dir1_size(follow_symlinks=True, workers=1)
+        )
+
+    def test_deep_tree_beyond_recursion_limit(self):
+        current = self.root / "deep"
+        current.mkdir()
+        for _ in range(150):
+            current = current / "d"
+            current.mkdir()
+
+        generator = TreeGenerator(str(self.root / "deep"))
+        old_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            node = generator.generate()
+        finally:
+            sys.setrecursionlimit(old_limit)
+
+        depth = 0
+        while node.children:
+            node = node.children[0]
+            depth += 1
+        self.assertEqual(depth, 150)
+
+    def test_parallel_matches_serial(self):
+        def collect(node, prefix=""):
+            paths = [prefix + node.name]
+            for child in node.children:
+                paths.extend(collect(child, prefix + node.name + "/"))
+            return paths
+
+        serial = TreeGenerator(str(self.root), show_hidden=True, workers=1)
+        parallel = TreeGenerator(str(self.root), show_hidden=True, workers=4)
+
+        self.assertEqual(
+            collect(serial.generate()),
+            collect(parallel.generate())
+        )
+
+    @unittest.skipIf(sys.platform == "win32", "symlinks need privileges on Windows")
+    def test_follow_symlink_cycle_terminates(self):
+        os.symlink(self.root / "dir1", self.root / "dir1" / "subdir1" / "back")
+
+        generator = TreeGenerator(str(self.root), follow_symlinks=True)
+        first = generator.get_tree_stats(generator.generate())
+        second = generator.get_tree_stats(generator.generate())
+
+        self.assertEqual(first, second)
+
+        tree = generator.generate()
+        dir1 = next(c for c in tree.children if c.name == "dir1")
+        subdir1 = next(c for c in dir1.children if c.name == "subdir1")
+        back = next(c for c in subdir1.children if c.name == "back")
+        self.assertTrue(back.is_symlink)
+        self.assertEqual(back.children, [])
+
+    @unittest.skipIf(sys.platform == "win32", "symlinks need privileges on Windows")
+    def test_follow_symlinks_after_retarget(self):
+        (self.root / "A").mkdir()
+        (self.root / "A" / "inner.txt").write_text("a")
+        link = self.root / "x"
+        os.symlink(self.root / "A", link)
+
+        generator = TreeGenerator(str(self.root), follow_symlinks=True)
+        generator.generate()
+        link.unlink()
+        os.symlink(self.root, link)
+
+        fresh = TreeGenerator(str(self.root), follow_symlinks=True)
+        self.assertEqual(
+            generator.get_tree_stats(generator.generate()),
+            fresh.get_tree_stats(fresh.generate())
+        )
+        x = next(c for c in generator.generate().children if c.name == "x")
+        self.assertEqual(x.children, [])
+
+    @unittest.skipIf(sys.platform == "win32", "symlinks need privileges on Windows")
+    def test_symlink_target_recorded(self):
+        os.symlink("file3.txt", self.root / "link")
+
+        generator = TreeGenerator(str(self.root))
+        link = next(c for c in generator.generate().children if c.name == "link")
+
+        self.assertTrue(link.is_symlink)
+        self.assertEqual(link.symlink_target, "file3.txt")
+        self.assertIn(
+            "link -> file3.txt",
+            TreeFormatter(colors=False).format_tree(generator.generate())
+        )
+
+    @unittest.skipIf(sys.platform == "win32", "symlinks need privileges on Windows")
+    def test_follow_symlinks_serial_matches_stream(self):
+        (self.root / "target" / "inner").mkdir(parents=True)
+        for i in range(1, 6):
+            (self.root / f"d{i}").mkdir()
+            os.symlink(os.path.join("..", "target"), self.root / f"d{i}" / "lnk")
+
+        generator = TreeGenerator(str(self.root), follow_symlinks=True, workers=1)
+        formatter = TreeFormatter(colors=False)
+
+        out = StringIO()
+        formatter.write_stream(generator.iter_entries(), out)
+
+        self.assertEqual(
+            out.getvalue(),
+            formatter.format_tree(generator.generate()) + "\n"
+        )
+
+    @unittest.skipIf(sys.platform == "win32", "symlinks need privileges on Windows")
+    def test_follow_symlinks_parallel_is_deterministic(self):
+        (self.root / "target" / "inner").mkdir(parents=True)
+        for i in range(1, 13):
+            (self.root / f"from{i}").mkdir()
+            os.symlink(os.path.join("..", "target"), self.root / f"from{i}" / "lnk")
+
+        formatter = TreeFormatter(colors=False)
+        expected = formatter.format_tree(
+            TreeGenerator(str(self.root), follow_symlinks=True, workers=1).generate()
+        )
+
+        for _ in range(50):
+            generator = TreeGenerator(str(self.root), follow_symlinks=True, workers=8)
+            root_node = generator.generate()
+            self.assertEqual(formatter.format_tree(root_node), expected)
+
+        links = [
+            child.children[0]
+            for child in root_node.children
+            if child.name.startswith("from")
+        ]
+        self.assertEqual(len(links), 12)
+        for link in links:
+            self.assertEqual([c.name for c in link.children], ["inner"])
+
     def test_tree_stats(self):
         generator = TreeGenerator(str(self.root), show_hidden=True)
         root_node = generator.generate()
@@ -120,13 +334,13 @@ class TestTreeFormatter(unittest.TestCase):
     def setUp(self):
         self.root = TreeNode(
             name="root",
-            path=Path("/root"),
+            path="/root",
             is_dir=True,
         )
         
         dir1 = TreeNode(
             name="dir1",
-            path=Path("/root/dir1"),
+            path="/root/dir1",
             is_dir=True,
         )
 
@@ -134,14 +348,14 @@ class TestTreeFormatter(unittest.TestCase):
         
         file1 = TreeNode(
             name="file1.txt",
-            path=Path("/root/file1.txt"),
+            path="/root/file1.txt",
             is_dir=False,
         )
 
         
         file2 = TreeNode(
             name="file2.txt",
-            path=Path("/root/dir1/file2.txt"),
+            path="/root/dir1/file2.txt",
             is_dir=False,
         )
         
@@ -168,6 +382,49 @@ class TestTreeFormatter(unittest.TestCase):
         self.assertEqual(data["name"], "root")
         self.assertEqual(data["type"], "directory")
 
+    def test_stream_matches_tree_formatting(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "dir1" / "subdir1").mkdir(parents=True)
+            (root / "dir1" / "subdir1" / "file2.txt").touch()
+            (root / "dir1" / "file1.txt").touch()
+            (root / "dir2").mkdir()
+            (root / "file3.txt").touch()
+
+            generator = TreeGenerator(temp_dir)
+            formatter = TreeFormatter(colors=False)
+
+            out = StringIO()
+            count = formatter.write_stream(generator.iter_entries(), out)
+
+            self.assertEqual(count, 7)
+            self.assertEqual(
+                out.getvalue(),
+                formatter.format_tree(generator.generate()) + "\n"
+            )
+
+    def test_json_format_deep_tree(self):
+        root = node = TreeNode(name="deep", path="/deep", is_dir=True)
+        for _ in range(150):
+            child = TreeNode(name="d", path=node.path + "/d", is_dir=True)
+            node.children.append(child)
+            node = child
+
+        formatter = TreeFormatter(format_type=OutputFormat.JSON)
+        old_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            output = formatter.format_tree(root)
+        finally:
+            sys.setrecursionlimit(old_limit)
+
+        data = json.loads(output)
+        depth = 0
+        while data["children"]:
+            data = data["children"][0]
+            depth += 1
+        self.assertEqual(depth, 150)
+
 
 class TestCLI(unittest.TestCase):
     def setUp(self):
@@ -191,6 +448,25 @@ class TestCLI(unittest.TestCase):
         exit_code = main([str(self.root), "--no-colors"])
         self.assertEqual(exit_code, 0)
     
+    def test_cli_path_only(self):
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+
+        try:
+            exit_code = main([str(self.root)])
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertEqual(exit_code, 0)
+        self.assertIn("file2.txt", output)
+    
+    def test_default_arguments_match_parser(self):
+        self.assertEqual(
+            vars(create_parser().parse_args([])),
+            vars(default_arguments())
+        )
+    
     def test_cli_with_depth(self):
         
         exit_code = main([str(self.root), "--depth", "1", "--no-colors"])